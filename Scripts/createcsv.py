@@ -2,81 +2,138 @@
 import pymysql
 import csv
 import os
-import json
-import platform
+import shutil
+import sys
 from datetime import datetime
 
-def load_db_config():
-    """
-    Load database configuration from appsettings.json based on OS
-    Windows: appsettings.Development.json
-    Ubuntu/Linux: appsettings.Production.json
+from db_config import load_db_config
+from db_pool import get_connection
+
+# File buffer size for CSV output (1 MiB)
+FILE_BUFFER_SIZE = 1024 * 1024
+
+# Number of rows fetched and written per chunk
+FETCH_CHUNK_SIZE = 10000
+
+# CSV header row (column order expected by import_csv.py)
+HEADERS = ['Id', 'Chinese', 'Pinyin', 'Pinyin_With_Tone', 
+           'Japanese_Meaning', 'Hsk_Level']
+
+# Server-side export of the data rows (header and BOM are written by the
+# client). ESCAPED BY '"' doubles embedded quotes the way csv.writer does;
+# unlike csv.writer, all string columns are quoted.
+OUTFILE_QUERY = (
+    "SELECT Id, Chinese, Pinyin, Pinyin_With_Tone, Japanese_Meaning, Hsk_Level "
+    "FROM hsk_words ORDER BY Id "
+    "INTO OUTFILE %s CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '\"' "
+    "LINES TERMINATED BY '\\r\\n'"
+)
+
+# MySQL error codes returned when INTO OUTFILE cannot be used
+# (1004: server cannot create file, 1045/1227: no FILE privilege,
+#  1086: file exists, 1290: secure_file_priv)
+OUTFILE_UNAVAILABLE_ERRORS = (1004, 1045, 1086, 1227, 1290)
+
+def export_with_outfile(cursor, output_file):
     """
-    # Detect OS
-    system = platform.system()
+    Export hsk_words with SELECT ... INTO OUTFILE
+    
+    The server writes the data rows to a temporary file next to
+    output_file; the client then writes the BOM and header row and
+    appends the data. Only usable when the server shares this
+    machine's filesystem.
+    
+    Args:
+        cursor: Database cursor
+        output_file (str): Output CSV filename
     
-    # Determine config file
-    if system == 'Windows':
-        config_file = 'appsettings.Development.json'
-        env = 'Development'
-    else:  # Linux/Ubuntu
-        config_file = 'appsettings.Production.json'
-        env = 'Production'
+    Returns:
+        int: Number of exported records (no file is written when 0)
     
-    print(f"Detected OS: {system} -> Using {env} environment")
+    Raises:
+        OSError: When the server-written file is not visible or not
+            readable here (e.g. created as mysql:mysql with mode 0640)
+    """
+    data_file = os.path.abspath(output_file) + '.data'
+    cursor.execute(OUTFILE_QUERY, (data_file,))
+    count = cursor.rowcount
     
-    # Get script directory and project root
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    config_path = os.path.join(project_root, config_file)
+    if not os.path.exists(data_file):
+        # Server wrote the file on its own filesystem (e.g. in a container)
+        print(f"Warning: {data_file} was left on the database server's filesystem; remove it there")
+        raise FileNotFoundError(f"Server-side file not visible on this machine: {data_file}")
     
-    # Load JSON file
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Parse connection string
-        conn_str = config['ConnectionStrings']['DefaultConnection']
-        
-        # Parse connection string to dict
-        db_config = {}
-        for item in conn_str.split(';'):
-            if '=' in item:
-                key, value = item.split('=', 1)
-                key = key.strip().lower()
-                value = value.strip()
-                
-                if key == 'server':
-                    db_config['host'] = value
-                elif key == 'database':
-                    db_config['database'] = value
-                elif key == 'user':
-                    db_config['user'] = value
-                elif key == 'password':
-                    db_config['password'] = value
-        
-        db_config['charset'] = 'utf8mb4'
+        if count:
+            with open(data_file, 'rb') as src, \
+                 open(output_file, 'w', newline='', encoding='utf-8-sig', buffering=FILE_BUFFER_SIZE) as csvfile:
+                # Write BOM and header row, then append data rows as bytes
+                csv.writer(csvfile).writerow(HEADERS)
+                csvfile.flush()
+                shutil.copyfileobj(src, csvfile.buffer, FILE_BUFFER_SIZE)
+    finally:
+        try:
+            os.remove(data_file)
+        except OSError as e:
+            print(f"Warning: could not remove {data_file}: {e}")
+    
+    return count
+
+def export_with_cursor(connection, output_file):
+    """
+    Stream hsk_words rows to CSV file on the client side
+    
+    Args:
+        connection: Database connection
+        output_file (str): Output CSV filename
+    
+    Returns:
+        int: Number of exported records (no file is written when 0)
+    """
+    # Create unbuffered cursor so rows are streamed from the server
+    with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+        # Get data from hsk_words table
+        query = """
+            SELECT Id, Chinese, Pinyin, Pinyin_With_Tone, 
+                   Japanese_Meaning, Hsk_Level
+            FROM hsk_words
+            ORDER BY Id
+        """
+        cursor.execute(query)
         
-        print(f"Loaded config: {config_file}")
-        print(f"  Host: {db_config['host']}")
-        print(f"  Database: {db_config['database']}")
-        print(f"  User: {db_config['user']}")
+        # Fetch first chunk to check for data before creating the file
+        chunk = cursor.fetchmany(FETCH_CHUNK_SIZE)
         
-        return db_config
+        if not chunk:
+            return 0
         
-    except FileNotFoundError:
-        print(f"Error: Config file not found: {config_path}")
-        raise
-    except Exception as e:
-        print(f"Error loading config: {e}")
-        raise
+        # Write to CSV file
+        with open(output_file, 'w', newline='', encoding='utf-8-sig', buffering=FILE_BUFFER_SIZE) as csvfile:
+            csv_writer = csv.writer(csvfile)
+            
+            # Write header row
+            csv_writer.writerow(HEADERS)
+            
+            # Write data rows chunk by chunk as they arrive
+            count = 0
+            while chunk:
+                csv_writer.writerows(chunk)
+                count += len(chunk)
+                chunk = cursor.fetchmany(FETCH_CHUNK_SIZE)
+    
+    return count
 
-def export_hsk_words_to_csv(output_file='hsk_words_export.csv'):
+def export_hsk_words_to_csv(output_file='hsk_words_export.csv', server_side=False):
     """
     Export hsk_words table data to CSV file
     
     Args:
         output_file (str): Output CSV filename
+        server_side (bool): Let the database server write the data rows
+            (SELECT ... INTO OUTFILE). Only enable when the server shares
+            this machine's filesystem; falls back to client-side export
+            when the server refuses or the file is not visible here.
     """
     connection = None
     try:
@@ -84,40 +141,31 @@ def export_hsk_words_to_csv(output_file='hsk_words_export.csv'):
         db_config = load_db_config()
         
         # Connect to database
-        connection = pymysql.connect(**db_config)
-        print(f"Connected to database: {db_config['database']}")
+        connection = get_connection()
+        print(f"Connected to database: {db_config.database}")
         
-        # Create cursor
-        with connection.cursor() as cursor:
-            # Get data from hsk_words table
-            query = """
-                SELECT Id, Chinese, Pinyin, Pinyin_With_Tone, 
-                       Japanese_Meaning, Hsk_Level
-                FROM hsk_words
-                ORDER BY Id
-            """
-            cursor.execute(query)
-            
-            # Fetch all data
-            rows = cursor.fetchall()
-            
-            if not rows:
-                print("No data found.")
-                return
-            
-            # Write to CSV file
-            with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                csv_writer = csv.writer(csvfile)
-                
-                # Write header row
-                headers = ['Id', 'Chinese', 'Pinyin', 'Pinyin_With_Tone', 
-                          'Japanese_Meaning', 'Hsk_Level']
-                csv_writer.writerow(headers)
-                
-                # Write data rows
-                csv_writer.writerows(rows)
-            
-            print(f"Exported {len(rows)} records to {output_file}")
+        count = None
+        if server_side:
+            try:
+                with connection.cursor() as cursor:
+                    count = export_with_outfile(cursor, output_file)
+            except pymysql.Error as e:
+                if e.args[0] not in OUTFILE_UNAVAILABLE_ERRORS:
+                    raise
+                print(f"SELECT ... INTO OUTFILE not available ({e.args[1]})")
+                print("Falling back to client-side export...")
+            except OSError as e:
+                print(f"Server-side export failed: {e}")
+                print("Falling back to client-side export...")
+        
+        if count is None:
+            count = export_with_cursor(connection, output_file)
+        
+        if not count:
+            print("No data found.")
+            return
+        
+        print(f"Exported {count} records to {output_file}")
             
     except pymysql.Error as e:
         print(f"Database error: {e}")
@@ -133,8 +181,12 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_file = f'hsk_words_{timestamp}.csv'
     
+    # --server-side: let the database server write the data rows
+    # (only when it runs on this machine's filesystem)
+    server_side = '--server-side' in sys.argv[1:]
+    
     # Execute export
-    export_hsk_words_to_csv(output_file)
+    export_hsk_words_to_csv(output_file, server_side=server_side)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+import codecs
+import json
+import platform
+import functools
+from dataclasses import dataclass
+
+try:
+    import orjson as json_parser
+except ImportError:  # orjson not installed -> standard json
+    json_parser = json
+
+# Connection string keys -> pymysql.connect parameters
+CONNECTION_KEY_MAP = {
+    'server': 'host',
+    'database': 'database',
+    'user': 'user',
+    'password': 'password',
+}
+
+# Parameters that must be present in the connection string
+REQUIRED_KEYS = ('host', 'database', 'user')
+
+# Detect OS and resolve config path once at import
+SYSTEM = platform.system()
+
+# Determine config file
+if SYSTEM == 'Windows':
+    CONFIG_FILE = 'appsettings.Development.json'
+    ENV = 'Development'
+else:  # Linux/Ubuntu
+    CONFIG_FILE = 'appsettings.Production.json'
+    ENV = 'Production'
+
+# Get script directory and project root
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+CONFIG_PATH = os.path.join(PROJECT_ROOT, CONFIG_FILE)
+
+@dataclass(frozen=True)
+class DBConfig:
+    """
+    Database connection settings (keyword arguments for pymysql.connect)
+    """
+    host: str
+    database: str
+    user: str
+    password: str = ''
+    charset: str = 'utf8mb4'
+
+@functools.lru_cache(maxsize=1)
+def load_db_config():
+    """
+    Load database configuration from appsettings.json based on OS
+    Windows: appsettings.Development.json
+    Ubuntu/Linux: appsettings.Production.json
+    
+    The result is cached for the lifetime of the process.
+    
+    Returns:
+        DBConfig: Database connection settings
+    """
+    print(f"Detected OS: {SYSTEM} -> Using {ENV} environment")
+    
+    # Load JSON file
+    try:
+        with open(CONFIG_PATH, 'rb') as f:
+            data = f.read()
+        
+        # Strip UTF-8 BOM (saved by Visual Studio); orjson rejects it
+        if data.startswith(codecs.BOM_UTF8):
+            data = data[len(codecs.BOM_UTF8):]
+        config = json_parser.loads(data)
+        
+        # Parse connection string
+        conn_str = config['ConnectionStrings']['DefaultConnection']
+        
+        # Parse connection string to dict
+        db_config = {}
+        for item in conn_str.split(';'):
+            key, sep, value = item.partition('=')
+            param = CONNECTION_KEY_MAP.get(key.strip().lower())
+            if sep and param:
+                db_config[param] = value.strip()
+        
+        # Validate required keys once
+        missing = [param for param in REQUIRED_KEYS if param not in db_config]
+        if missing:
+            raise ValueError(f"Missing connection string keys: {', '.join(missing)}")
+        
+        db_config = DBConfig(**db_config)
+        
+        print(f"Loaded config: {CONFIG_FILE}")
+        print(f"  Host: {db_config.host}")
+        print(f"  Database: {db_config.database}")
+        print(f"  User: {db_config.user}")
+        
+        return db_config
+        
+    except FileNotFoundError:
+        print(f"Error: Config file not found: {CONFIG_PATH}")
+        raise
+    except Exception as e:
+        print(f"Error loading config: {e}")
+        raise
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import pymysql
+from dataclasses import asdict
+
+from db_config import load_db_config
+
+try:
+    from dbutils.pooled_db import PooledDB
+except ImportError:  # DBUtils not installed -> plain connections
+    PooledDB = None
+
+# Pool settings
+POOL_MIN_CACHED = 1
+POOL_MAX_CACHED = 5
+POOL_MAX_CONNECTIONS = 10
+
+# Client error codes meaning the connection itself is gone
+# (2006: server has gone away, 2013/2055: lost connection)
+CONNECTION_LOST_ERRORS = (2006, 2013, 2055)
+
+# Pools keyed by connection settings, created on first use
+_pools = {}
+
+def is_connection_lost(error):
+    """
+    Tell DBUtils which errors are fatal for the connection
+
+    Only lost connections trigger its reconnect; statement errors such as
+    a refused LOAD DATA LOCAL INFILE keep the connection and its session.
+
+    Args:
+        error: Exception raised by pymysql
+    """
+    if isinstance(error, pymysql.err.InterfaceError):
+        return True
+    return bool(error.args) and error.args[0] in CONNECTION_LOST_ERRORS
+
+def get_connection(**options):
+    """
+    Get a database connection, reusing pooled connections within the process
+
+    Connection settings come from load_db_config. Uses DBUtils PooledDB
+    when installed, otherwise opens a new pymysql connection. Calling
+    close() on the result returns it to the pool.
+
+    Args:
+        **options: Extra keyword arguments for pymysql.connect
+    """
+    db_config = {**asdict(load_db_config()), **options}
+
+    if PooledDB is None:
+        return pymysql.connect(**db_config)
+
+    key = tuple(sorted(db_config.items()))
+    pool = _pools.get(key)
+    if pool is None:
+        pool = PooledDB(
+            creator=pymysql,
+            mincached=POOL_MIN_CACHED,
+            maxcached=POOL_MAX_CACHED,
+            maxconnections=POOL_MAX_CONNECTIONS,
+            blocking=True,
+            isfatal=is_connection_lost,
+            **db_config
+        )
+        _pools[key] = pool
+
+    return pool.connection()
+
+def main():
+    # Open a connection through the same path the scripts use
+    print(f"Pooling: {'DBUtils PooledDB' if PooledDB else 'disabled (DBUtils not installed)'}")
+    connection = get_connection()
+    try:
+        connection.begin()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            print(f"SELECT 1 -> {cursor.fetchone()[0]}")
+        connection.rollback()
+    finally:
+        connection.close()
+
+if __name__ == '__main__':
+    main()
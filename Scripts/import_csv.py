@@ -1,134 +1,358 @@
 # -*- coding: utf-8 -*-
 import pymysql
 import csv
+import sys
+import itertools
 import os
-import json
-import platform
+import tempfile
+import concurrent.futures
 
-def load_db_config():
+from db_config import load_db_config
+from db_pool import get_connection
+
+# File buffer size for CSV input (1 MiB)
+FILE_BUFFER_SIZE = 1024 * 1024
+
+# Number of rows sent per executemany call.
+# The optimum depends on row size and server settings (max_allowed_packet),
+# so re-measure when the dataset changes significantly.
+BATCH_SIZE = 1000
+
+# Number of parallel import connections (1 = single transaction)
+IMPORT_WORKERS = 1
+
+# Keep the plain INSERT ... VALUES form so pymysql's executemany
+# folds each batch into a single multi-row statement
+INSERT_QUERY = (
+    "INSERT INTO hsk_words "
+    "(Id, Chinese, Pinyin, Pinyin_With_Tone, Japanese_Meaning, Hsk_Level) "
+    "VALUES (%s, %s, %s, %s, %s, %s)"
+)
+
+# Server-side CSV parsing; column order matches export_hsk_words_to_csv
+LOAD_DATA_QUERY = (
+    "LOAD DATA LOCAL INFILE %s INTO TABLE hsk_words "
+    "CHARACTER SET utf8mb4 "
+    "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+    "LINES TERMINATED BY %s "
+    "IGNORE 1 LINES "
+    "(Id, Chinese, Pinyin, Pinyin_With_Tone, Japanese_Meaning, Hsk_Level)"
+)
+
+# MySQL error codes returned when LOCAL INFILE is disabled
+LOCAL_INFILE_DISABLED_ERRORS = (1148, 3948, 3950)
+
+# Number of LOAD DATA warnings printed before aborting
+MAX_REPORTED_WARNINGS = 10
+
+def detect_line_terminator(csv_file):
+    """
+    Detect line terminator (CRLF or LF) from the header line of CSV file
+    
+    Args:
+        csv_file (str): CSV file path
+    
+    Returns:
+        str: '\\r\\n' or '\\n'
     """
-    Load database configuration from appsettings.json based on OS
-    Windows: appsettings.Development.json
-    Ubuntu/Linux: appsettings.Production.json
+    with open(csv_file, 'rb') as f:
+        return '\r\n' if f.readline().endswith(b'\r\n') else '\n'
+
+def check_load_warnings(cursor):
     """
-    # Detect OS
-    system = platform.system()
+    Fail if the previous statement produced warnings
     
-    # Determine config file
-    if system == 'Windows':
-        config_file = 'appsettings.Development.json'
-        env = 'Development'
-    else:  # Linux/Ubuntu
-        config_file = 'appsettings.Production.json'
-        env = 'Production'
+    Args:
+        cursor: Database cursor
     
-    print(f"Detected OS: {system} -> Using {env} environment")
+    Raises:
+        pymysql.err.DataError: When any warning was reported
+    """
+    cursor.execute("SHOW COUNT(*) WARNINGS")
+    warning_count = cursor.fetchone()[0]
+    if not warning_count:
+        return
     
-    # Get script directory and project root
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    config_path = os.path.join(project_root, config_file)
+    cursor.execute("SHOW WARNINGS LIMIT %s", (MAX_REPORTED_WARNINGS,))
+    warnings = cursor.fetchall()
+    for level, code, message in warnings:
+        print(f"  {level} {code}: {message}")
     
-    # Load JSON file
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # Parse connection string
-        conn_str = config['ConnectionStrings']['DefaultConnection']
-        
-        # Parse connection string to dict
-        db_config = {}
-        for item in conn_str.split(';'):
-            if '=' in item:
-                key, value = item.split('=', 1)
-                key = key.strip().lower()
-                value = value.strip()
-                
-                if key == 'server':
-                    db_config['host'] = value
-                elif key == 'database':
-                    db_config['database'] = value
-                elif key == 'user':
-                    db_config['user'] = value
-                elif key == 'password':
-                    db_config['password'] = value
-        
-        db_config['charset'] = 'utf8mb4'
+    code, message = (warnings[0][1], warnings[0][2]) if warnings else (0, 'not shown')
+    raise pymysql.err.DataError(
+        code, f"LOAD DATA reported {warning_count} warnings (first: {message})"
+    )
+
+def load_data_infile(cursor, csv_file, line_terminator):
+    """
+    Bulk load CSV file into hsk_words with LOAD DATA LOCAL INFILE
+    
+    Args:
+        cursor: Cursor of a connection opened with local_infile=True
+        csv_file (str): CSV file path to import
+        line_terminator (str): Line terminator from detect_line_terminator
+    
+    Returns:
+        int: Number of loaded records
+    """
+    cursor.execute(LOAD_DATA_QUERY, (csv_file, line_terminator))
+    loaded_count = cursor.rowcount
+    
+    # LOCAL implies IGNORE: bad values and duplicate Ids only raise warnings
+    check_load_warnings(cursor)
+    
+    return loaded_count
+
+def insert_csv_rows(cursor, csv_file, batch_size=BATCH_SIZE):
+    """
+    Insert CSV rows into hsk_words with batched executemany
+    
+    Args:
+        cursor: Database cursor
+        csv_file (str): CSV file path to import
+        batch_size (int): Number of rows sent per executemany call
+    
+    Returns:
+        int: Number of inserted records
+    """
+    inserted_count = 0
+    with open(csv_file, 'r', encoding='utf-8-sig', buffering=FILE_BUFFER_SIZE) as f:
+        # Column order is fixed by export_hsk_words_to_csv:
+        # Id, Chinese, Pinyin, Pinyin_With_Tone, Japanese_Meaning, Hsk_Level
+        # Values are sent as strings; MySQL casts Id and Hsk_Level to INT
+        reader = csv.reader(f)
+        next(reader, None)  # skip header
+        rows = filter(None, reader)  # skip blank lines like DictReader
         
-        print(f"Loaded config: {config_file}")
-        print(f"  Host: {db_config['host']}")
-        print(f"  Database: {db_config['database']}")
-        print(f"  User: {db_config['user']}")
+        # Send rows as one multi-row INSERT per batch
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            cursor.executemany(INSERT_QUERY, batch)
+            inserted_count += len(batch)
+            
+            # Progress indicator (stderr, no forced flush)
+            print(f"  Inserted {inserted_count} records...", file=sys.stderr, flush=False)
+    
+    return inserted_count
+
+def load_csv_file(cursor, csv_file, line_terminator, batch_size=BATCH_SIZE):
+    """
+    Load CSV file into hsk_words, preferring LOAD DATA LOCAL INFILE
+    
+    Falls back to batched INSERT when the server refuses LOCAL INFILE.
+    
+    Args:
+        cursor: Cursor of a connection opened with local_infile=True
+        csv_file (str): CSV file path to import
+        line_terminator (str): Line terminator from detect_line_terminator
+        batch_size (int): Number of rows sent per executemany call
+    
+    Returns:
+        int: Number of imported records
+    """
+    try:
+        return load_data_infile(cursor, csv_file, line_terminator)
+    except pymysql.Error as e:
+        # Server refuses LOCAL INFILE -> fall back to batched INSERT
+        if e.args[0] not in LOCAL_INFILE_DISABLED_ERRORS:
+            raise
+        print(f"  LOAD DATA LOCAL INFILE not available ({e.args[1]})")
+        print("  Falling back to batched INSERT...")
+        return insert_csv_rows(cursor, csv_file, batch_size)
+
+def bulk_load(connection, csv_file, line_terminator, batch_size=BATCH_SIZE):
+    """
+    Load CSV file into hsk_words and commit, with constraint checks disabled
+    
+    Args:
+        connection: Connection opened with local_infile=True
+        csv_file (str): CSV file path to import
+        line_terminator (str): Line terminator from detect_line_terminator
+        batch_size (int): Number of rows sent per executemany call
+    
+    Returns:
+        int: Number of imported records
+    """
+    with connection.cursor() as cursor:
+        # Skip per-row constraint checks during bulk load
+        cursor.execute("SET unique_checks=0")
+        cursor.execute("SET foreign_key_checks=0")
         
-        return db_config
+        try:
+            # Explicit transaction; with DBUtils this also stops a failed
+            # statement from being silently re-run on a new connection
+            connection.begin()
+            inserted_count = load_csv_file(cursor, csv_file, line_terminator, batch_size)
+            
+            # Commit all changes
+            connection.commit()
+        finally:
+            # Restore checks before the connection is reused
+            try:
+                cursor.execute("SET unique_checks=1")
+                cursor.execute("SET foreign_key_checks=1")
+            except pymysql.Error:
+                # Connection is unusable; keep the original load error
+                pass
+    
+    return inserted_count
+
+def split_csv_file(csv_file, parts):
+    """
+    Split CSV data rows into byte ranges that start and end on record boundaries
+    
+    Quoted fields may contain raw newlines (csv.writer and INTO OUTFILE
+    both write them), so a newline only ends a record when the number of
+    quote characters before it is even.
+    
+    Args:
+        csv_file (str): CSV file path
+        parts (int): Number of ranges to produce
+    
+    Returns:
+        tuple: (header line bytes, list of (start, end) byte offsets)
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, 'rb') as f:
+        header = f.readline()
+        offset = f.tell()
+        bounds = [offset]
+        data_size = size - offset
+        targets = [offset + data_size * i // parts for i in range(1, parts)]
         
-    except FileNotFoundError:
-        print(f"Error: Config file not found: {config_path}")
-        raise
-    except Exception as e:
-        print(f"Error loading config: {e}")
+        in_quotes = False
+        for line in f:
+            if not targets:
+                break
+            offset += len(line)
+            
+            # An odd number of quotes toggles whether a quoted field is open
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            
+            # Split at the first record boundary past each target offset
+            if not in_quotes and offset >= targets[0]:
+                if offset < size:
+                    bounds.append(offset)
+                targets = [t for t in targets if t > offset]
+        bounds.append(size)
+    
+    return header, list(zip(bounds, bounds[1:]))
+
+def import_csv_chunk(csv_file, header, start, end, line_terminator, batch_size=BATCH_SIZE):
+    """
+    Import one byte range of CSV file on a dedicated connection
+    
+    The range is copied to a temporary CSV file (with the header line)
+    so it can be loaded the same way as a whole file.
+    
+    Args:
+        csv_file (str): CSV file path
+        header (bytes): Header line of the CSV file
+        start (int): Start byte offset of the range
+        end (int): End byte offset of the range
+        line_terminator (str): Line terminator from detect_line_terminator
+        batch_size (int): Number of rows sent per executemany call
+    
+    Returns:
+        int: Number of imported records
+    """
+    with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as tmp:
+        with open(csv_file, 'rb') as src:
+            src.seek(start)
+            tmp.write(header)
+            tmp.write(src.read(end - start))
+    
+    connection = None
+    try:
+        connection = get_connection(local_infile=True)
+        return bulk_load(connection, tmp.name, line_terminator, batch_size)
+    except Exception:
+        if connection:
+            connection.rollback()
         raise
+    finally:
+        if connection:
+            connection.close()
+        os.remove(tmp.name)
 
-def import_csv_to_db(csv_file):
+def import_csv_parallel(csv_file, header, ranges, line_terminator,
+                        workers=IMPORT_WORKERS, batch_size=BATCH_SIZE):
+    """
+    Import CSV file with several worker connections in parallel
+    
+    Each chunk is committed by its own worker, so a failure may leave
+    the table partially imported.
+    
+    Args:
+        csv_file (str): CSV file path to import
+        header (bytes): Header line of the CSV file
+        ranges (list): (start, end) byte offsets from split_csv_file
+        line_terminator (str): Line terminator from detect_line_terminator
+        workers (int): Number of parallel connections
+        batch_size (int): Number of rows sent per executemany call
+    
+    Returns:
+        int: Number of imported records
+    """
+    print(f"  Importing {len(ranges)} chunks with {workers} workers...")
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(import_csv_chunk, csv_file, header, start, end,
+                            line_terminator, batch_size)
+            for start, end in ranges
+        ]
+        return sum(future.result() for future in futures)
+
+def import_csv_to_db(csv_file, batch_size=BATCH_SIZE, workers=IMPORT_WORKERS):
     """
     Delete all data from hsk_words table and import from CSV file
     
     Args:
         csv_file (str): CSV file path to import
+        batch_size (int): Number of rows sent per executemany call
+        workers (int): Number of parallel import connections.
+            1 imports in a single transaction; more than 1 commits
+            each chunk separately.
     """
     connection = None
     try:
+        # Read the CSV file before touching the table (TRUNCATE cannot be
+        # undone): a missing or unreadable file aborts here
+        line_terminator = detect_line_terminator(csv_file)
+        if workers > 1:
+            header, ranges = split_csv_file(csv_file, workers)
+        
         # Load database config from appsettings.json
         db_config = load_db_config()
         
-        connection = pymysql.connect(**db_config)
-        print(f"Connected to database: {db_config['database']}")
+        # local_infile enables LOAD DATA LOCAL INFILE on the client side
+        connection = get_connection(local_infile=True)
+        print(f"Connected to database: {db_config.database}")
         
         with connection.cursor() as cursor:
             # Step 1: Delete all existing data
-            print("\nStep 1: Deleting existing data...")
-            cursor.execute("DELETE FROM hsk_words")
-            deleted_count = cursor.rowcount
-            print(f"Deleted {deleted_count} records")
-            
-            # Step 2: Reset auto increment (optional)
-            print("\nStep 2: Resetting auto increment...")
-            cursor.execute("ALTER TABLE hsk_words AUTO_INCREMENT = 1")
+            # TRUNCATE commits implicitly, so it is not undone on later failure
+            print("\nStep 1: Truncating hsk_words table...")
+            cursor.execute("TRUNCATE TABLE hsk_words")
+            print("Table truncated (this cannot be rolled back)")
             
-            # Step 3: Read CSV and insert data
-            print(f"\nStep 3: Importing data from {csv_file}...")
+            # Step 2: Read CSV and insert data
+            print(f"\nStep 2: Importing data from {csv_file}...")
             
-            insert_query = """
-                INSERT INTO hsk_words 
-                (Id, Chinese, Pinyin, Pinyin_With_Tone, Japanese_Meaning, Hsk_Level)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
+            if workers > 1:
+                inserted_count = import_csv_parallel(csv_file, header, ranges, line_terminator,
+                                                     workers, batch_size)
+            else:
+                inserted_count = bulk_load(connection, csv_file, line_terminator, batch_size)
             
-            inserted_count = 0
-            with open(csv_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    cursor.execute(insert_query, (
-                        int(row['Id']),
-                        row['Chinese'],
-                        row['Pinyin'],
-                        row['Pinyin_With_Tone'],
-                        row['Japanese_Meaning'],
-                        int(row['Hsk_Level'])
-                    ))
-                    inserted_count += 1
-                    
-                    # Progress indicator
-                    if inserted_count % 100 == 0:
-                        print(f"  Inserted {inserted_count} records...")
-            
-            # Commit all changes
-            connection.commit()
             print(f"\nCompleted! Inserted {inserted_count} records successfully.")
             
-            # Step 4: Verify data
-            print("\nStep 4: Verifying data...")
+            # Step 3: Verify data
+            print("\nStep 3: Verifying data...")
             cursor.execute("SELECT COUNT(*) FROM hsk_words")
             total = cursor.fetchone()[0]
             
@@ -146,7 +370,10 @@ def import_csv_to_db(csv_file):
         print(f"Database error: {e}")
         if connection:
             connection.rollback()
-            print("Transaction rolled back")
+            if workers > 1:
+                print("Chunks committed by other workers were kept; the table may be partially imported")
+            else:
+                print("Transaction rolled back")
     except Exception as e:
         print(f"Error occurred: {e}")
         if connection:
@@ -164,7 +391,7 @@ def main():
     csv_file = 'hsk_words_20260201_125927.csv'
     
     print(f"\nThis will:")
-    print(f"  1. DELETE all existing data from hsk_words table")
+    print(f"  1. TRUNCATE hsk_words table (existing data cannot be restored on failure)")
     print(f"  2. Import data from: {csv_file}")
     
     confirm = input("\nProceed? (y/n): ")